@@ -1,5 +1,7 @@
 import random
+from typing import Optional
 
+import numpy as np
 from PIL import Image
 from PIL import ImageColor
 from PIL import ImageDraw
@@ -9,95 +11,133 @@ from Malevich.tech import Tech
 color_scheme = "RGB"
 min = 0
 
+colors = ("aliceblue", "antiquewhite", "aqua", "aquamarine", "azure", "beige", "bisque", "black",
+          "blue", "blueviolet", "brown", "chocolate", "coral", "cornflowerblue",
+          "cornsilk", "crimson", "cyan", "darkblue", "darkcyan", "darkgoldenrod", "darkgray", "darkgrey",
+          "darkgreen",
+          "darkkhaki", "darkmagenta", "darkolivegreen", "darkorange", "darkorchid", "darkred", "darksalmon",
+          "darkseagreen", "darkslateblue", "darkslategray", "darkslategrey", "darkturquoise", "darkviolet",
+          "deeppink",
+          "deepskyblue", "dimgray", "dimgrey", "dodgerblue", "firebrick", "floralwhite", "forestgreen",
+          "fuchsia",
+          "gainsboro", "ghostwhite", "gold", "goldenrod", "gray", "grey", "green", "greenyellow", "honeydew",
+          "hotpink",
+          "indianred", "indigo", "ivory", "khaki", "lavender", "lavenderblush", "lawngreen", "lemonchiffon",
+          "lightblue", "lightcoral", "lightcyan", "lightgoldenrodyellow", "lightgreen", "lightgray",
+          "lightgrey",
+          "lightpink",
+          "lightsalmon", "lightseagreen", "lightskyblue", "lightslategray", "lightslategrey", "lightsteelblue",
+          "lightyellow", "lime", "limegreen", "linen", "magenta", "maroon", "mediumaquamarine", "mediumblue",
+          "mediumorchid", "mediumpurple", "mediumseagreen", "mediumslateblue", "mediumspringgreen",
+          "mediumturquoise",
+          "mediumvioletred", "midnightblue", "mintcream", "mistyrose", "moccasin", "navajowhite", "navy",
+          "oldlace",
+          "olive", "olivedrab", "orange", "orangered", "orchid", "palegoldenrod", "palegreen", "paleturquoise",
+          "palevioletred", "papayawhip", "peachpuff", "peru", "pink", "plum", "powderblue", "purple",
+          "rebeccapurple",
+          "red", "rosybrown", "royalblue", "saddlebrown", "salmon", "sandybrown", "seagreen", "seashell",
+          "sienna",
+          "silver", "skyblue", "slateblue", "slategray", "slategrey", "snow", "springgreen", "steelblue", "tan",
+          "teal", "thistle", "tomato", "turquoise", "violet", "wheat", "white", "whitesmoke", "yellow",
+          "yellowgreen")
+
+bw = ("black", "white")
+
+palettes = (colors, bw)
+
+colors_rgb = tuple(ImageColor.getrgb(color) for color in colors)
+
+bw_rgb = tuple(ImageColor.getrgb(color) for color in bw)
+
+palettes_rgb = (colors_rgb, bw_rgb)
+
+palette_sizes = np.array([len(palette) for palette in palettes_rgb])
+
+palette_offsets = np.cumsum(palette_sizes) - palette_sizes
+
+rgb_table = np.array(colors_rgb + bw_rgb, dtype=np.uint8)
+
 
 class AvantGuard:
     tech = Tech()
+    rng = np.random.default_rng()
 
     def random_palette(self):
-        colors = ["aliceblue", "antiquewhite", "aqua", "aquamarine", "azure", "beige", "bisque", "black",
-                  "blue", "blueviolet", "brown", "chocolate", "coral", "cornflowerblue",
-                  "cornsilk", "crimson", "cyan", "darkblue", "darkcyan", "darkgoldenrod", "darkgray", "darkgrey",
-                  "darkgreen",
-                  "darkkhaki", "darkmagenta", "darkolivegreen", "darkorange", "darkorchid", "darkred", "darksalmon",
-                  "darkseagreen", "darkslateblue", "darkslategray", "darkslategrey", "darkturquoise", "darkviolet",
-                  "deeppink",
-                  "deepskyblue", "dimgray", "dimgrey", "dodgerblue", "firebrick", "floralwhite", "forestgreen",
-                  "fuchsia",
-                  "gainsboro", "ghostwhite", "gold", "goldenrod", "gray", "grey", "green", "greenyellow", "honeydew",
-                  "hotpink",
-                  "indianred", "indigo", "ivory", "khaki", "lavender", "lavenderblush", "lawngreen", "lemonchiffon",
-                  "lightblue", "lightcoral", "lightcyan", "lightgoldenrodyellow", "lightgreen", "lightgray",
-                  "lightgrey",
-                  "lightpink",
-                  "lightsalmon", "lightseagreen", "lightskyblue", "lightslategray", "lightslategrey", "lightsteelblue",
-                  "lightyellow", "lime", "limegreen", "linen", "magenta", "maroon", "mediumaquamarine", "mediumblue",
-                  "mediumorchid", "mediumpurple", "mediumseagreen", "mediumslateblue", "mediumspringgreen",
-                  "mediumturquoise",
-                  "mediumvioletred", "midnightblue", "mintcream", "mistyrose", "moccasin", "navajowhite", "navy",
-                  "oldlace",
-                  "olive", "olivedrab", "orange", "orangered", "orchid", "palegoldenrod", "palegreen", "paleturquoise",
-                  "palevioletred", "papayawhip", "peachpuff", "peru", "pink", "plum", "powderblue", "purple",
-                  "rebeccapurple",
-                  "red", "rosybrown", "royalblue", "saddlebrown", "salmon", "sandybrown", "seagreen", "seashell",
-                  "sienna",
-                  "silver", "skyblue", "slateblue", "slategray", "slategrey", "snow", "springgreen", "steelblue", "tan",
-                  "teal", "thistle", "tomato", "turquoise", "violet", "wheat", "white", "whitesmoke", "yellow",
-                  "yellowgreen"]
-
-        bw = ["black", "white"]
-
-        palette = [colors, bw]
-        return random.choice(palette)
-
-    def generate_image(self, width, height, patch: bool, lines: bool, polygon: bool, eclipse: bool, rectangle: bool):
-        image = Image.new(color_scheme, (width, height), self.random_color())
-        draw = ImageDraw.Draw(image)
+        return random.choice(palettes)
+
+    def generate_image(self, width, height, patch: bool, lines: bool, polygon: bool, eclipse: bool, rectangle: bool,
+                       out_path: Optional[str] = None):
+        background = self.random_rgb()
         if patch is True:
-            for i in range(self.tech.random_int(min, height)):
-                image.paste((self.random_color()), (
-                    self.tech.random_int(min, width), self.tech.random_int(min, height),
-                    self.tech.random_int(min, width),
-                    self.tech.random_int(min, height)))
-
-        for i in range(random.randint(min, 50)):
-            if lines is True:
-                draw.line(self.random_parameters(height), fill=ImageColor.getrgb(self.random_color()))
-            else:
-                pass
-            if polygon is True:
-                draw.polygon(self.random_polygon(width, height), fill=self.random_color(), outline=self.random_color())
-            else:
-                pass
-
-        for j in range(random.randint(min, 5)):
-            if eclipse is True:
-                draw.ellipse(self.random_parameters(width), fill=ImageColor.getcolor(self.random_color(), color_scheme))
-            else:
-                pass
-
-        for x in range(random.randint(min, 10)):
-            if rectangle is True:
-                draw.rectangle(self.random_parameters(width),
-                               fill=ImageColor.getcolor(self.random_color(), color_scheme))
-            else:
-                pass
+            canvas = np.empty((height, width, 3), dtype=np.uint8)
+            canvas[:] = background
+            patches_count = self.rng.integers(min, height, endpoint=True)
+            for (x0, y0, x1, y1), rgb in zip(self.random_boxes(width, height, patches_count),
+                                             self.random_rgbs(patches_count)):
+                canvas[y0:y1, x0:x1] = rgb
+            image = Image.fromarray(canvas)
+        else:
+            image = Image.new(color_scheme, (width, height), background)
+        draw = ImageDraw.Draw(image)
+
+        shapes = []
+        if lines is True or polygon is True:
+            count = self.rng.integers(min, 50, endpoint=True)
+            for box, line_rgb, fill_rgb, outline_rgb in zip(self.random_boxes(height, height, count),
+                                                            self.random_rgbs(count), self.random_rgbs(count),
+                                                            self.random_rgbs(count)):
+                if lines is True:
+                    shapes.append((draw.line, box, {"fill": line_rgb}))
+                if polygon is True:
+                    shapes.append((draw.polygon, self.random_polygon(width, height),
+                                   {"fill": fill_rgb, "outline": outline_rgb}))
+        if eclipse is True:
+            count = self.rng.integers(min, 5, endpoint=True)
+            shapes += [(draw.ellipse, box, {"fill": rgb})
+                       for box, rgb in zip(self.random_boxes(width, width, count, ordered=True),
+                                           self.random_rgbs(count))]
+        if rectangle is True:
+            count = self.rng.integers(min, 10, endpoint=True)
+            shapes += [(draw.rectangle, box, {"fill": rgb})
+                       for box, rgb in zip(self.random_boxes(width, width, count, ordered=True),
+                                           self.random_rgbs(count))]
+
+        for draw_shape, xy, options in shapes:
+            draw_shape(xy, **options)
+
+        if out_path is not None:
+            image.save(out_path, "JPEG", quality=92, subsampling=2, optimize=False)
+            return out_path
         image_file = self.tech.create_random_filename()
         image.save(image_file)
         return image_file
 
-    def random_parameters(self, upper_range):
-        return (random.randint(min, upper_range), random.randint(min, upper_range),
-                random.randint(min, upper_range), random.randint(min, upper_range))
+    def random_boxes(self, x, y, count, ordered=False):
+        boxes = self.rng.integers(min, (x, y, x, y), size=(count, 4), endpoint=True)
+        if ordered:
+            boxes = np.hstack((np.minimum(boxes[:, :2], boxes[:, 2:]), np.maximum(boxes[:, :2], boxes[:, 2:])))
+        return [tuple(box) for box in boxes.tolist()]
 
     def random_polygon(self, x, y):
-        try:
-            length = random.randint(2, 500)
-            polygon_x = random.sample(range(1, x), length)
-            polygon_y = random.sample(range(1, y), length)
-            return polygon_x + polygon_y
-        except Exception as error:
-            print(error)
-            pass
+        vertices = self.rng.integers(3, 10, endpoint=True)
+        center_x, center_y = self.rng.integers(min, (x, y), endpoint=True)
+        radius = self.rng.uniform(10, max(10, np.minimum(x, y) / 4))
+        step = 2 * np.pi / vertices
+        angles = np.cumsum(self.rng.uniform(step * 0.5, step * 1.5, vertices))
+        angles *= 2 * np.pi / angles[-1]
+        radii = np.clip(self.rng.normal(radius, radius * 0.3, vertices), 0, 2 * radius)
+        polygon = np.empty(2 * vertices, dtype=np.int64)
+        polygon[0::2] = center_x + radii * np.cos(angles)
+        polygon[1::2] = center_y + radii * np.sin(angles)
+        return polygon.tolist()
 
     def random_color(self):
         return random.choice(self.random_palette())
+
+    def random_rgb(self):
+        return self.random_rgbs(1)[0]
+
+    def random_rgbs(self, count):
+        palette_ids = self.rng.integers(len(palettes_rgb), size=count)
+        indices = palette_offsets[palette_ids] + self.rng.integers(palette_sizes[palette_ids])
+        return [tuple(rgb) for rgb in rgb_table[indices].tolist()]
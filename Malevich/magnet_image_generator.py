@@ -2,6 +2,7 @@
 
 import random
 import string
+from typing import Optional
 
 import numpy as np
 from PIL import Image
@@ -50,7 +51,7 @@ class Magnet:
         args = [self.buildImg(depth + 1) for n in range(nArgs)]
         return func(*args)
 
-    def creaate_image(self):
+    def creaate_image(self, out_path: Optional[str] = None):
         img = self.buildImg()
 
         # Ensure it has the right dimensions, dX by dY by 3
@@ -58,4 +59,10 @@ class Magnet:
 
         # Convert to 8-bit, send to PIL and save
         img8Bit = np.uint8(np.rint(img.clip(0.0, 1.0) * 255.0))
-        Image.fromarray(img8Bit).save(self.tech.create_random_filename())
+        image = Image.fromarray(img8Bit)
+        if out_path is not None:
+            image.save(out_path, "JPEG", quality=92, subsampling=2, optimize=False)
+            return out_path
+        image_file = self.tech.create_random_filename()
+        image.save(image_file)
+        return image_file
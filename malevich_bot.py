@@ -1,10 +1,15 @@
+import argparse
+import multiprocessing
 import random
 
+import numpy as np
+
 from Malevich.magnet_image_generator import Magnet
 from Malevich import avantguard
 
 width = 1200
 height = 1200
+images_count = 10
 ag = avantguard.AvantGuard()
 magnet = Magnet(width, height)
 
@@ -16,6 +21,19 @@ def generate_image():
                              random.choice(boolean), random.choice(boolean))
 
 
+def generate_masterpiece(seed):
+    random.seed(int(seed.generate_state(1)[0]))
+    ag.rng = np.random.default_rng(seed)
+    return random.choice([generate_image, magnet.creaate_image])()
+
+
 if __name__ == "__main__":
-    for i in range(10):
-        random.choice([generate_image(), magnet.creaate_image()])
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=None,
+                        help="number of worker processes (defaults to the CPU count)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for a reproducible batch (random by default)")
+    args = parser.parse_args()
+    seeds = np.random.SeedSequence(args.seed).spawn(images_count)
+    with multiprocessing.Pool(args.processes) as pool:
+        pool.map(generate_masterpiece, seeds)